@@ -11,15 +11,385 @@ Description:
   生成的身份证号码符合国家标准（GB 11643-1999）的校验规则。
   行政区划代码基于民政部2022年数据，支持白名单过滤。
 """
-import calendar
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import functools
 import itertools
 import json
 from multiprocessing import Pool, cpu_count
 import re
+import threading
 from tqdm import tqdm
 
+try:
+    import numpy as np
+except ImportError:  # 未安装NumPy时退回纯Python实现
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # 未安装Numba时使用NumPy向量化实现
+    njit = None
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _check_codes_kernel(digits, weights, table):
+        """编译后的校验码计算内核（Numba）
+        
+        外层并行已由进程池提供，此处按行顺序计算，避免与进程池争抢线程。
+        
+        Args:
+            digits (numpy.ndarray): (N,17) 的uint8数字矩阵
+            weights (numpy.ndarray): 17位加权因子
+            table (numpy.ndarray): 校验码字符的ASCII查找表
+        
+        Returns:
+            numpy.ndarray: (N,) 的校验码ASCII数组
+        """
+        out = np.empty(digits.shape[0], np.uint8)
+        for i in range(digits.shape[0]):
+            total = 0
+            for j in range(17):
+                total += digits[i, j] * weights[j]
+            out[i] = table[total % 11]
+        return out
+else:
+    _check_codes_kernel = None
+
+
+# 非闰年各月天数（下标即月份，0为占位）
+_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# 全部3位顺序码（000-999），用于全通配符顺序码模式
+_ALL_SEQ3 = tuple(f"{i:03d}" for i in range(1000))
+
+
+@functools.lru_cache(maxsize=None)
+def _is_leap_year(year):
+    """优化的闰年判断算法
+    
+    规则：
+    1. 能被4整除
+    2. 且不能被100整除，除非能被400整除
+    
+    Args:
+        year (int): 待判断年份
+    
+    Returns:
+        bool: 是否为闰年
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _leaps_le(year):
+    """统计公元1年至指定年份（含）的闰年数量（闭式公式）
+    
+    Args:
+        year (int): 截止年份
+    
+    Returns:
+        int: 闰年数量
+    """
+    return year // 4 - year // 100 + year // 400
+
+
+def _estimate_wildcard_days(month, common_max, leap_max, leap_count,
+                            total_years):
+    """全通配符快速估算（适用于类似--的日期模式）
+    
+    Args:
+        month (int): 目标月份（1-12）
+        common_max (int): 非闰年该月最大天数
+        leap_max (int): 闰年该月最大天数（仅2月不同）
+        leap_count (int): 闰年总数
+        total_years (int): 总年份数
+    
+    Returns:
+        int: 估算的天数组合
+    """
+    if month != 2:
+        # 非二月月份直接取最大值（如--模式在1月表示31天）
+        return total_years * common_max
+    else:
+        # 二月特殊处理：闰年29天 + 非闰年28天
+        return leap_count * leap_max + (total_years -
+                                        leap_count) * common_max
+
+
+def _calculate_exact_days(leap_years, common_years, month, day_pattern,
+                          common_max, leap_max):
+    """精确日期模式计算（适用于混合模式如1-、-5等）
+    
+    计算步骤：
+    1. 分别计算闰年组和非闰年组的天数可能性
+    2. 汇总结果
+    
+    Args:
+        leap_years (tuple): 候选年份中的闰年
+        common_years (tuple): 候选年份中的非闰年
+        month (int): 目标月份
+        day_pattern (str): 日期模式字符串
+        common_max (int): 非闰年最大天数
+        leap_max (int): 闰年最大天数
+    
+    Returns:
+        int: 精确的天数组合
+    """
+    # 两组计算量极小，顺序执行即可（仅2月的闰年组最大天数不同）
+    return (_calc_group_days(leap_years, day_pattern,
+                             leap_max if month == 2 else common_max) +
+            _calc_group_days(common_years, day_pattern, common_max))
+
+
+def _calc_group_days(years, day_pattern, max_day):
+    """分组天数计算（核心匹配逻辑）
+    
+    实现细节：
+    1. 日期模式为两位（十位、个位各自固定或通配），按四种情况直接计数
+    2. 有效天数 × 年数 = 总组合数
+    
+    Args:
+        years (tuple): 同类型年份元组（全闰年或全非闰年）
+        day_pattern (str): 日期模式（如1-、-5）
+        max_day (int): 该组最大天数
+    
+    Returns:
+        int: 该年份组的天数组合数
+    """
+    if not years:
+        return 0
+
+    tens, units = day_pattern
+    if tens != '-' and units != '-':
+        # 两位均固定：只需判断是否在有效范围内
+        valid_days = 1 if 1 <= int(day_pattern) <= max_day else 0
+    elif tens != '-':
+        # 十位固定：统计 [t0, t9] 与 [1, max_day] 的交集长度
+        lower = max(1, int(tens) * 10)
+        upper = min(max_day, int(tens) * 10 + 9)
+        valid_days = max(0, upper - lower + 1)
+    elif units != '-':
+        # 个位固定：统计 u, 10+u, 20+u ... 中不超过max_day的个数（排除0日）
+        unit = int(units)
+        if max_day < unit:
+            valid_days = 0
+        else:
+            valid_days = min(9, (max_day - unit) // 10) + 1 - (unit == 0)
+    else:
+        # 两位均通配：1至max_day全部有效
+        valid_days = max_day
+
+    return len(years) * valid_days
+
+
+@functools.lru_cache(maxsize=256)
+def _re(pattern):
+    """编译并缓存正则表达式
+    
+    Args:
+        pattern (str): 正则表达式
+    
+    Returns:
+        re.Pattern: 编译后的正则对象
+    """
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=None)
+def _generate_numbers_tuple(pattern, min_val, max_val):
+    """枚举符合数字模式且位于取值范围内的数值
+    
+    Args:
+        pattern (str): 数字模式（如"199-")
+        min_val (int): 最小值
+        max_val (int): 最大值
+    
+    Returns:
+        tuple[int]: 符合要求的数值（升序）
+    """
+    # 处理无通配符情况
+    if '-' not in pattern:
+        num = int(pattern)
+        return (num,) if min_val <= num <= max_val else ()
+
+    # 计算有效范围（如"199-" → 1990-1999）
+    length = len(pattern)
+    lower = int(pattern.replace('-', '0').ljust(length, '0'))
+    upper = int(pattern.replace('-', '9').ljust(length, '9'))
+    start = max(min_val, lower)
+    end = min(max_val, upper)
+
+    # 生成候选并过滤（仅比较固定位，保证模式匹配）
+    fixed = [(i, c) for i, c in enumerate(pattern) if c != '-']
+    fmt_str = f"{{:0{length}d}}"
+    return tuple(num for num in range(start, end + 1)
+                 if all(fmt_str.format(num)[i] == c for i, c in fixed))
+
+
+def _bounded(iterable, semaphore, stop):
+    """限流生成器：每产出一项前先占用一个信号量名额
+    
+    消费方每取回一个结果后释放一个名额，从而限制进程池中积压的任务数。
+    
+    Args:
+        iterable (iterable): 原始任务序列
+        semaphore (threading.Semaphore): 控制积压上限的信号量
+        stop (threading.Event): 置位后停止产出
+    
+    Yields:
+        任务序列中的元素
+    """
+    for item in iterable:
+        semaphore.acquire()
+        if stop.is_set():
+            return
+        yield item
+
+
+def _check_code(id_17, weights, check_codes):
+    """计算单个校验码（第18位）
+    
+    Args:
+        id_17 (str): 前17位身份证号
+        weights (tuple): 17位加权因子
+        check_codes (str): 校验码对照表
+    
+    Returns:
+        str: 校验码（0-9或X）
+    """
+    total = sum(int(c) * w for c, w in zip(id_17, weights))
+    return check_codes[total % 11]
+
+
+def _check_codes_batch(id17_list, weights, check_codes, weights_np=None,
+                       table_np=None):
+    """批量计算校验码
+    
+    提供NumPy数组参数时走向量化（或Numba编译）路径，否则逐个计算。
+    
+    Args:
+        id17_list (list[str]): 前17位身份证号列表
+        weights (tuple): 17位加权因子
+        check_codes (str): 校验码对照表
+        weights_np (numpy.ndarray): 加权因子数组
+        table_np (numpy.ndarray): 校验码字符的ASCII查找表
+    
+    Returns:
+        str: 与输入顺序一致、逐字符对应的校验码字符串
+    """
+    if weights_np is None or not id17_list:
+        return ''.join(_check_code(id_17, weights, check_codes)
+                       for id_17 in id17_list)
+
+    digits = np.frombuffer(''.join(id17_list).encode('ascii'),
+                           dtype=np.uint8).reshape(-1, 17) - ord('0')
+    # 非数字字符减去'0'后会回绕为大于9的值，与纯Python实现一致地报错
+    if (digits > 9).any():
+        raise ValueError("前17位只能包含数字")
+    if _check_codes_kernel is not None:
+        codes = _check_codes_kernel(digits, weights_np, table_np)
+    else:
+        codes = table_np[(digits @ weights_np) % 11]
+    return codes.tobytes().decode('ascii')
+
+
+def _vector_tables(weights, check_codes):
+    """构建批量向量化计算所用的权重数组与校验码查找表（需安装NumPy）
+    
+    Args:
+        weights (tuple): 17位加权因子
+        check_codes (str): 校验码对照表
+    
+    Returns:
+        tuple: (权重数组, 校验码ASCII查找表)，未安装NumPy时均为None
+    """
+    if np is None:
+        return None, None
+    return (np.array(weights, dtype=np.int32),
+            np.frombuffer(check_codes.encode('ascii'), dtype=np.uint8))
+
+
+def _build_ids(args_list, seqs, check_char, calc_batch):
+    """组合(地区码, 日期)与顺序码，计算校验码并过滤校验位
+    
+    Args:
+        args_list (list[tuple]): (地区码, 日期) 组合列表
+        seqs (tuple): 顺序码候选（每个组合都会完整遍历一次）
+        check_char (str): 要求的校验位（'-'表示不限）
+        calc_batch (callable): 批量校验码计算函数
+    
+    Returns:
+        tuple: (处理的组合数, 校验位匹配的身份证号列表)
+    """
+    # 展开顺序码并组合前17位身份证号
+    id17_list = [
+        region + date_str + seq
+        for region, date_str in args_list for seq in seqs
+    ]
+    # 批量计算校验位（第18位），拼接并过滤校验位匹配项
+    codes = calc_batch(id17_list)
+    return len(id17_list), [
+        id_17 + code for id_17, code in zip(id17_list, codes)
+        if check_char in ('-', code)
+    ]
+
+
+# 工作进程内的计算参数（由 _init_worker 在进程启动时设置）
+_worker_state = {}
+
+
+def _init_worker(weights, check_codes, seqs, check_char):
+    """进程池初始化函数
+    
+    每个工作进程启动时保存一次计算参数，任务中只需传递(地区码, 日期)组合，
+    无需为每个任务序列化生成器实例。
+    
+    Args:
+        weights (tuple): 17位加权因子
+        check_codes (str): 校验码对照表
+        seqs (tuple): 顺序码候选
+        check_char (str): 要求的校验位（'-'表示不限）
+    """
+    weights_np, table_np = _vector_tables(weights, check_codes)
+    _worker_state['calc'] = functools.partial(_check_codes_batch,
+                                              weights=weights,
+                                              check_codes=check_codes,
+                                              weights_np=weights_np,
+                                              table_np=table_np)
+    _worker_state['seqs'] = seqs
+    _worker_state['check_char'] = check_char
+
+
+def _pack_task(batch):
+    """将一批(地区码, 日期)组合打包为两个定长拼接字符串
+    
+    相比逐个序列化元组，工作进程反序列化两个连续字符串的开销要小得多。
+    
+    Args:
+        batch (list[tuple]): (地区码, 日期) 组合列表
+    
+    Returns:
+        tuple: (6位地区码拼接串, 8位日期拼接串)
+    """
+    return (''.join(region for region, _ in batch),
+            ''.join(date_str for _, date_str in batch))
+
+
+def _worker(task):
+    """多进程工作单元：处理一批打包后的(地区码, 日期)组合
+    
+    Args:
+        task (tuple): _pack_task 生成的 (地区码拼接串, 日期拼接串)
+    
+    Returns:
+        tuple: (处理的组合数, 校验位匹配的身份证号列表)
+    """
+    regions, dates = task
+    args_list = [(regions[i * 6:i * 6 + 6], dates[i * 8:i * 8 + 8])
+                 for i in range(len(regions) // 6)]
+    return _build_ids(args_list, _worker_state['seqs'],
+                      _worker_state['check_char'], _worker_state['calc'])
+
 
 class ChineseIdGenerator:
     """身份证号码生成器核心类"""
@@ -33,12 +403,28 @@ class ChineseIdGenerator:
         # 校验位计算参数（GB 11643-1999标准）
         self.weights = (7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2)
         self.check_codes = '10X98765432'
+        # 批量向量化计算所用的权重数组与校验码查找表（需安装NumPy）
+        self.weights_np, self.check_codes_np = _vector_tables(
+            self.weights, self.check_codes)
+        if _check_codes_kernel is not None and self.weights_np is not None:
+            # 预热一次，摊薄JIT编译开销
+            _check_codes_kernel(np.zeros((1, 17), dtype=np.uint8),
+                                self.weights_np, self.check_codes_np)
 
         # 加载行政区划代码白名单
         with open(region_file, "r", encoding="utf-8") as f:
             self.regions = json.load(f)
         self.valid_regions = set(self.regions.keys())  # 有效地区代码集合
 
+        # 构建按位置、数字划分的位图索引：pos_masks[pos][digit] 的第i位为1
+        # 表示 region_tuple[i] 第pos位上的数字为digit
+        self.region_tuple = tuple(sorted(self.valid_regions))
+        self.pos_masks = [[0] * 10 for _ in range(6)]
+        for i, code in enumerate(self.region_tuple):
+            for pos, ch in enumerate(code):
+                self.pos_masks[pos][int(ch)] |= 1 << i
+        self._region_cache = {}  # filter_regions 的结果缓存（按模式）
+
     def parallel_generate(self, input_id, processes=None):
         """并行生成主入口
         
@@ -49,46 +435,106 @@ class ChineseIdGenerator:
         Returns:
             list: 所有有效身份证号列表
         """
+        results = []
+        for valid in self.iter_generate(input_id, processes):
+            results.extend(valid)
+
+        # 笛卡尔积本身不重复，无需去重
+        return results
+
+    def generate_to_file(self, input_id, output_path, processes=None,
+                         preview=1):
+        """并行生成并将结果逐批写入文件
+        
+        结果不在内存中累积，内存占用与结果数量无关；没有有效号码时不创建文件。
+        
+        Args:
+            input_id (str): 18位输入模式
+            output_path (str): 结果文件路径（每行一个号码）
+            processes (int): 进程数（默认使用全部核心）
+            preview (int): 保留在内存中用于展示的示例号码数量
+        
+        Returns:
+            tuple: (有效号码总数, 前preview个示例号码列表)
+        """
+        count = 0
+        examples = []
+        f = None
+        try:
+            for valid in self.iter_generate(input_id, processes):
+                if not valid:
+                    continue
+                if f is None:
+                    f = open(output_path, "w")
+                f.write('\n'.join(valid) + '\n')
+                count += len(valid)
+                examples.extend(valid[:preview - len(examples)])
+        finally:
+            if f is not None:
+                f.close()
+        return count, examples
+
+    def iter_generate(self, input_id, processes=None):
+        """并行生成核心流程，按批产出有效身份证号
+        
+        地区码 × 日期 × 顺序码的笛卡尔积本身不重复，各批次之间不会产生重复号码。
+        
+        Args:
+            input_id (str): 18位输入模式
+            processes (int): 进程数（默认使用全部核心）
+        
+        Yields:
+            list[str]: 一批校验位匹配的身份证号
+        """
         pattern = self.parse_pattern(input_id)
         check_char = pattern['check']
 
+        # 前17位无通配符时仅有一个组合，直接在当前进程计算，省去进程池开销
+        if '-' not in input_id[:17]:
+            _, valid = self.process_batch(
+                list(self.generate_components(pattern)), pattern['sequence'],
+                check_char)
+            yield valid
+            return
+
         # 初始化进度条（尝试预估总数）
         try:
             total = self.estimate_total(pattern)
         except:
             total = None  # 无法预估时显示动态进度
 
+        # 顺序码与校验参数在工作进程启动时一次性下发，任务中只传递(地区码, 日期)
+        seqs = self.generate_sequence(pattern['sequence'])
+        processes = processes or cpu_count()
         with tqdm(total=total, desc="生成进度", unit="comb") as pbar:
-            with Pool(processes or cpu_count()) as pool:
+            with Pool(processes,
+                      initializer=_init_worker,
+                      initargs=(self.weights, self.check_codes, seqs,
+                                check_char)) as pool:
                 chunks = self.generate_components(pattern)
-                results = []
 
-                # 分块处理（避免内存不足）
-                chunk_size = 100000  # 每批处理10万组合
-                while True:
-                    batch = list(itertools.islice(chunks, chunk_size))
-                    if not batch:
-                        break
+                # 按任务切分组合（每个任务约2000组合，摊薄进程间通信开销），
+                # 打包为定长拼接字符串后以生成器形式交给进程池，
+                # 由工作进程边生产边消费
+                task_size = max(1, 2000 // len(seqs))
+                tasks = map(_pack_task, iter(
+                    lambda: list(itertools.islice(chunks, task_size)), []))
 
+                # 限制已派发但未取回的任务数，避免进程池任务队列无限增长
+                in_flight = threading.Semaphore(4 * processes)
+                stop = threading.Event()
+                try:
                     # 并行计算校验码
-                    validated = pool.imap_unordered(self.process_batch, batch)
-                    for id_list in validated:
-                        # 过滤校验位匹配项
-                        valid = [
-                            id_num for id_num in id_list
-                            if check_char in ('-', id_num[-1])
-                        ]
-                        results.extend(valid)
-                        pbar.update(len(id_list))  # 更新进度条
-
-                # 去重并保留顺序
-                seen = set()
-                final = []
-                for id_num in results:
-                    if id_num not in seen:
-                        seen.add(id_num)
-                        final.append(id_num)
-                return final
+                    validated = pool.imap_unordered(
+                        _worker, _bounded(tasks, in_flight, stop))
+                    for count, valid in validated:
+                        in_flight.release()
+                        pbar.update(count)  # 更新进度条
+                        yield valid
+                finally:
+                    # 唤醒可能阻塞中的任务派发线程并令其退出
+                    stop.set()
+                    in_flight.release()
 
     def parse_pattern(self, pattern):
         """解析18位身份证模式字符串
@@ -127,23 +573,56 @@ class ChineseIdGenerator:
         return region_count * date_count * seq_count
 
     def filter_regions(self, pattern):
-        """根据正则表达式过滤有效行政区划代码
+        """根据模式过滤有效行政区划代码（结果按模式缓存在实例中）
+        
+        Args:
+            pattern (str): 行政区划代码模式（'-'表示任意数字）
+        
+        Returns:
+            tuple: 匹配的行政区划代码
+        """
+        codes = self._region_cache.get(pattern)
+        if codes is None:
+            codes = self._region_cache[pattern] = self._match_regions(pattern)
+        return codes
+
+    def _match_regions(self, pattern):
+        """匹配行政区划代码
+        
+        纯数字与通配符组成的6位模式直接对位图索引做按位与运算，
+        其余模式退回正则表达式逐个匹配。
         
         Args:
-            pattern (str): 行政区划代码模式（支持正则表达式）
+            pattern (str): 行政区划代码模式（'-'表示任意数字）
         
         Returns:
-            list: 匹配的行政区划代码列表
+            tuple: 匹配的行政区划代码
         """
-        regex = re.compile(pattern.replace('-', '.'))
-        return [code for code in self.valid_regions if regex.match(code)]
+        if len(pattern) != 6 or any(c not in '0123456789-' for c in pattern):
+            regex = _re(pattern.replace('-', '.'))
+            return tuple(code for code in self.region_tuple
+                         if regex.match(code))
+
+        # 逐位求交集
+        mask = (1 << len(self.region_tuple)) - 1
+        for pos, ch in enumerate(pattern):
+            if ch != '-':
+                mask &= self.pos_masks[pos][int(ch)]
+
+        # 按置位位置取出对应代码
+        codes = []
+        while mask:
+            low = mask & -mask
+            codes.append(self.region_tuple[low.bit_length() - 1])
+            mask ^= low
+        return tuple(codes)
 
     def estimate_dates(self, pattern):
         """日期组合估算引擎（核心优化算法）
         
         采用分治策略：
         1. 按年份分组处理
-        2. 按月份并行计算
+        2. 按月份逐一计算
         3. 根据日期模式选择快速估算或精确计算
         
         Args:
@@ -152,203 +631,79 @@ class ChineseIdGenerator:
         Returns:
             int: 有效的日期组合总数
         """
-
-        def _estimate_wildcard_days(month, common_max, leap_max, leap_count,
-                                    total_years):
-            """全通配符快速估算（适用于类似--的日期模式）
-            
-            Args:
-                month (int): 目标月份（1-12）
-                common_max (int): 非闰年该月最大天数
-                leap_max (int): 闰年该月最大天数（仅2月不同）
-                leap_count (int): 闰年总数
-                total_years (int): 总年份数
-            
-            Returns:
-                int: 估算的天数组合
-            """
-            if month != 2:
-                # 非二月月份直接取最大值（如--模式在1月表示31天）
-                return total_years * common_max
-            else:
-                # 二月特殊处理：闰年29天 + 非闰年28天
-                return leap_count * leap_max + (total_years -
-                                                leap_count) * common_max
-
-        def _calculate_exact_days(years, month, day_pattern, common_max,
-                                  leap_max):
-            """精确日期模式计算（适用于混合模式如1-、-5等）
-            
-            采用多线程加速：
-            1. 将年份分为闰年组和非闰年组
-            2. 并行计算两组的天数可能性
-            3. 汇总结果
-            
-            Args:
-                years (list): 候选年份列表
-                month (int): 目标月份
-                day_pattern (str): 日期模式字符串
-                common_max (int): 非闰年最大天数
-                leap_max (int): 闰年最大天数
-            
-            Returns:
-                int: 精确的天数组合
-            """
-            count = 0
-            year_groups = {
-                'leap': [y for y in years if _is_leap_year(y)],
-                'common': [y for y in years if not _is_leap_year(y)]
-            }
-
-            # 使用线程池并行处理两组计算（提升计算密集型任务效率）
-            with ThreadPoolExecutor() as executor:
-                futures = []
-                for key in ['leap', 'common']:
-                    # 确定该组的二月最大天数（仅当月份为2时生效）
-                    max_day = leap_max if key == 'leap' and month == 2 else common_max
-                    futures.append(
-                        executor.submit(_calc_group_days, year_groups[key],
-                                        day_pattern, max_day))
-                # 汇总各线程结果
-                for f in futures:
-                    count += f.result()
-            return count
-
-        def _calc_group_days(years, day_pattern, max_day):
-            """分组天数计算（核心匹配逻辑）
-            
-            实现细节：
-            1. 生成日期候选范围
-            2. 使用正则表达式进行模式匹配
-            3. 有效天数 × 年数 = 总组合数
-            
-            Args:
-                years (list): 同类型年份列表（全闰年或全非闰年）
-                day_pattern (str): 日期模式（如1-、-5）
-                max_day (int): 该组最大天数
-            
-            Returns:
-                int: 该年份组的天数组合数
-            """
-            if not years:
-                return 0
-
-            # 解析日期模式长度（始终为2位）
-            day_length = len(day_pattern)
-
-            # 计算日期范围（考虑模式约束）
-            lower = int(day_pattern.replace('-', '0').ljust(day_length, '0'))
-            upper = int(day_pattern.replace('-', '9').ljust(day_length, '9'))
-            start = max(1, lower)
-            end = min(max_day, upper)
-
-            if start > end:  # 无效范围（如指定2月30日）
-                return 0
-
-            # 构建正则表达式（将-替换为.通配符，实现模式匹配）
-            regex = re.compile(day_pattern.replace('-', '.'))
-
-            # 统计有效天数（正则匹配优化）
-            valid_days = sum(1 for d in range(start, end + 1)
-                             if regex.match(f"{d:0{day_length}d}"))
-
-            return len(years) * valid_days
-
-        def _is_leap_year(year):
-            """优化的闰年判断算法
-            
-            规则：
-            1. 能被4整除
-            2. 且不能被100整除，除非能被400整除
-            
-            Args:
-                year (int): 待判断年份
-            
-            Returns:
-                bool: 是否为闰年
-            """
-            return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
-
-        # 主逻辑开始----------------------------------------------------
         year_part = pattern['year']
         month_part = pattern['month']
         day_part = pattern['day']
 
         # 步骤1：生成候选年份（1900-2999之间）
-        years = list(self.generate_numbers(year_part, 1900, 2999))
+        years = self.generate_numbers(year_part, 1900, 2999)
         if not years:
             return 0
 
-        # 步骤2：统计闰年特征
-        leap_years = sum(1 for y in years if _is_leap_year(y))
+        # 步骤2：统计闰年特征（连续年份区间直接使用闭式公式）
         total_years = len(years)
+        if years[-1] - years[0] + 1 == total_years:
+            leap_years = _leaps_le(years[-1]) - _leaps_le(years[0] - 1)
+        else:
+            leap_years = sum(1 for y in years if _is_leap_year(y))
 
         # 步骤3：生成候选月份（1-12月）
-        months = list(self.generate_numbers(month_part, 1, 12))
+        months = self.generate_numbers(month_part, 1, 12)
         if not months:
             return 0
 
         # 步骤4：分析日期模式特征
         day_wildcards = day_part.count('-')
         is_special_day = any(c.isdigit() for c in day_part)
+        use_estimate = not is_special_day and day_wildcards > 0
+
+        # 精确计算时一次性划分闰年组与非闰年组，供各月份复用
+        if not use_estimate:
+            leap_group = tuple(y for y in years if _is_leap_year(y))
+            common_group = tuple(y for y in years if not _is_leap_year(y))
 
         total = 0
         for month in months:
-            # 获取基准天数（2001为非闰年）
-            common_max_day = calendar.monthrange(2001, month)[1]  # 非闰年
+            # 获取基准天数（非闰年）
+            common_max_day = _DAYS[month]  # 非闰年
             leap_max_day = 29 if month == 2 else common_max_day
 
             # 模式决策：全通配符使用快速估算，否则精确计算
-            if not is_special_day and day_wildcards > 0:
+            if use_estimate:
                 total += _estimate_wildcard_days(month, common_max_day,
                                                  leap_max_day, leap_years,
                                                  total_years)
             else:
-                total += _calculate_exact_days(years, month, day_part,
-                                               common_max_day, leap_max_day)
+                total += _calculate_exact_days(leap_group, common_group, month,
+                                               day_part, common_max_day,
+                                               leap_max_day)
 
         return total
 
     def generate_numbers(self, pattern, min_val, max_val):
-        """数值生成核心方法
+        """数值生成核心方法（结果按模式与取值范围缓存）
         
         Args:
             pattern (str): 数字模式（如"199-")
             min_val (int): 最小值
             max_val (int): 最大值
         
-        Yields:
-            int: 符合要求的数值
+        Returns:
+            tuple[int]: 符合要求的数值（升序）
         """
-        # 处理无通配符情况
-        if '-' not in pattern:
-            num = int(pattern)
-            if min_val <= num <= max_val:
-                yield num
-            return
-
-        # 计算有效范围（如"199-" → 1990-1999）
-        length = len(pattern)
-        lower = int(pattern.replace('-', '0').ljust(length, '0'))
-        upper = int(pattern.replace('-', '9').ljust(length, '9'))
-        start = max(min_val, lower)
-        end = min(max_val, upper)
-
-        # 生成候选并过滤（保证模式匹配）
-        fmt_str = f"{{:0{length}d}}"
-        for num in range(start, end + 1):
-            candidate = fmt_str.format(num)
-            if all(c == '-' or c == o for c, o in zip(pattern, candidate)):
-                yield num
+        return _generate_numbers_tuple(pattern, min_val, max_val)
 
     def generate_components(self, pattern):
         """生成候选组件笛卡尔积
         
+        顺序码由工作进程按模式在本地展开，此处只组合地区码与日期，
+        以减少跨进程传输的对象数量。
+        
         Args:
             pattern (dict): 解析后的模式字典
         
         Returns:
-            itertools.product: 候选组件的笛卡尔积生成器
+            itertools.product: (地区码, 日期) 的笛卡尔积生成器
         """
         # 1. 处理行政区划代码
         valid_regions = self.filter_regions(pattern['region'])
@@ -360,11 +715,8 @@ class ChineseIdGenerator:
                                        pattern['day'])
         dates = list(date_gen)
 
-        # 3. 生成顺序码候选
-        seq_gen = self.generate_sequence(pattern['sequence'])
-
-        # 返回三者的笛卡尔积（地区码 × 日期 × 顺序码）
-        return itertools.product(valid_regions, dates, seq_gen)
+        # 返回二者的笛卡尔积（地区码 × 日期）
+        return itertools.product(valid_regions, dates)
 
     def generate_dates(self, year_pattern, month_pattern, day_pattern):
         """生成有效日期（YYYYMMDD格式）
@@ -383,14 +735,12 @@ class ChineseIdGenerator:
         for year in self.generate_numbers(year_pattern, 1900, 2999):
             # 生成候选月份（1-12月）
             for month in self.generate_numbers(month_pattern, 1, 12):
-                try:
-                    # 获取当月最大天数（考虑闰年）
-                    max_day = calendar.monthrange(year, month)[1]
-                    # 生成候选日期
-                    for day in self.generate_numbers(day_pattern, 1, max_day):
-                        yield f"{year:04d}{month:02d}{day:02d}"
-                except:  # 处理非法月份（如2月30日）
-                    continue
+                # 获取当月最大天数（考虑闰年）
+                max_day = (29 if month == 2 and _is_leap_year(year) else
+                           _DAYS[month])
+                # 生成候选日期（超出当月天数的日期由取值范围排除）
+                for day in self.generate_numbers(day_pattern, 1, max_day):
+                    yield f"{year:04d}{month:02d}{day:02d}"
 
     def generate_sequence(self, pattern):
         """生成顺序码候选（3位数字）
@@ -399,42 +749,41 @@ class ChineseIdGenerator:
             pattern (str): 顺序码模式（如"01-")
         
         Returns:
-            generator: 所有可能的顺序码组合
+            tuple[str]: 所有可能的顺序码组合（可重复遍历）
         """
         wild_count = pattern.count('-')
         if wild_count == 0:  # 无通配符直接返回
-            return [pattern]
+            return (pattern,)
+        if pattern == '---':  # 全通配符直接返回预生成的全部顺序码
+            return _ALL_SEQ3
 
         # 构建通配符组合（如"01-" → ["010"..."019"]）
         parts = []
         for c in pattern:
             parts.append('0123456789' if c == '-' else c)
-        return (''.join(p) for p in itertools.product(*parts))
+        return tuple(''.join(p) for p in itertools.product(*parts))
 
-    def process_batch(self, args):
-        """批量生成身份证号并计算校验码（多进程工作单元）
+    def process_batch(self, args_list, seq_pattern, check_char='-'):
+        """批量生成身份证号并计算校验码
         
         功能说明：
-          将行政区划码、日期码、顺序码组合成前17位身份证号，计算校验码后返回完整18位身份证号。
-          该函数设计为多进程池的工作单元，需保持无状态且可序列化。
+          将行政区划码、日期码与展开的顺序码组合成前17位身份证号，计算校验码后返回完整18位身份证号。
+          与多进程工作单元 _worker 逻辑一致，便于在当前进程中直接处理一批组合；
+          校验位不匹配的号码会被丢弃。
         
         Args:
-            args (tuple): 包含以下元素的元组
+            args_list (list[tuple]): 组合列表，每个元组包含以下元素
                 - region (str): 6位行政区划代码（如"110101"）
                 - date_str (str): 8位出生日期字符串（格式YYYYMMDD）
-                - seq (str): 3位顺序码（如"001"）
+            seq_pattern (str): 顺序码模式（如"01-"）
+            check_char (str): 要求的校验位（'-'表示不限）
         
         Returns:
-            list[str]: 包含单个有效身份证号的列表（保持返回类型统一以便结果合并）
+            tuple: (该批次处理的组合数, 校验位匹配的身份证号列表)
         """
-        # 解包输入参数
-        region, date_str, seq = args
-        # 组合前17位身份证号
-        id_17 = region + date_str + seq
-        # 计算校验位（第18位）
-        check_code = self.calculate_check_code(id_17)
-        # 返回完整身份证号（列表形式保持多进程接口统一）
-        return [id_17 + check_code]
+        seqs = self.generate_sequence(seq_pattern)
+        return _build_ids(args_list, seqs, check_char,
+                          self.calculate_check_codes_batch)
 
     def calculate_check_code(self, id_17):
         """计算校验码（第18位）
@@ -445,8 +794,24 @@ class ChineseIdGenerator:
         Returns:
             str: 校验码（0-9或X）
         """
-        total = sum(int(c) * w for c, w in zip(id_17, self.weights))
-        return self.check_codes[total % 11]
+        return _check_code(id_17, self.weights, self.check_codes)
+
+    def calculate_check_codes_batch(self, id17_list):
+        """批量计算校验码（向量化实现）
+        
+        将N个前17位号码转换为 (N,17) 的数字矩阵，与权重向量做一次矩阵乘法后
+        取模查表，一次性得到全部校验码；安装了Numba时改用编译内核完成计算。
+        计算全程保持uint8数组，仅在返回前整体解码一次。
+        未安装NumPy时逐个调用模块级函数 _check_code 计算。
+        
+        Args:
+            id17_list (list[str]): 前17位身份证号列表
+        
+        Returns:
+            str: 与输入顺序一致、逐字符对应的校验码字符串
+        """
+        return _check_codes_batch(id17_list, self.weights, self.check_codes,
+                                  self.weights_np, self.check_codes_np)
 
 
 # 使用示例
@@ -464,15 +829,12 @@ if __name__ == "__main__":
             continue
 
         print("正在生成有效的身份号码...")
-        results = generator.parallel_generate(input_id)
-        print(f"\n共找到 {len(results)} 个有效号码")
-
-        if results:
-            # 结果保存
-            file_name = datetime.now().strftime("%Y%m%d_%H%M%S") + ".txt"
-            with open(file_name, "w") as f:
-                for id in results:
-                    f.write(id + "\n")
+        # 结果逐批写入文件，内存中只保留示例号码
+        file_name = datetime.now().strftime("%Y%m%d_%H%M%S") + ".txt"
+        count, examples = generator.generate_to_file(input_id, file_name)
+        print(f"\n共找到 {count} 个有效号码")
+
+        if count:
             print("完整结果已保存至文件：" + file_name)
-            print("示例号码:", results[0])
-            print("所属地区:", generator.regions.get(results[0][:6], "未知"))
+            print("示例号码:", examples[0])
+            print("所属地区:", generator.regions.get(examples[0][:6], "未知"))
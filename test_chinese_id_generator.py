@@ -0,0 +1,42 @@
+"""
+FilePath: test_chinese_id_generator.py
+Description: 
+  ChineseIdGenerator 的回归测试。
+"""
+import os
+import unittest
+
+from chinese_id_generator import ChineseIdGenerator
+
+REGION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "region_codes.json")
+
+
+class ProcessBatchTest(unittest.TestCase):
+    """process_batch 单进程入口测试"""
+
+    def setUp(self):
+        self.generator = ChineseIdGenerator(region_file=REGION_FILE)
+        self.pairs = [('110101', '19900307'), ('110102', '19900307'),
+                      ('110105', '19900307')]
+
+    def test_mixed_sequence_expands_for_every_pair(self):
+        # 混合顺序码模式需对每个(地区码, 日期)组合都完整展开
+        count, ids = self.generator.process_batch(self.pairs, '01-')
+        self.assertEqual(count, 30)
+        self.assertEqual(len(ids), 30)
+        self.assertEqual({id_num[:6] for id_num in ids},
+                         {region for region, _ in self.pairs})
+
+    def test_check_char_filter(self):
+        count, ids = self.generator.process_batch(self.pairs, '---', 'X')
+        self.assertEqual(count, 3000)
+        self.assertTrue(ids)
+        for id_num in ids:
+            self.assertEqual(id_num[-1], 'X')
+            self.assertEqual(
+                self.generator.calculate_check_code(id_num[:17]), 'X')
+
+
+if __name__ == "__main__":
+    unittest.main()